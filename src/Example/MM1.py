@@ -1,4 +1,4 @@
-from simple_sim import Model, RESERVED
+from simple_sim import Model, RESERVED, ARRIVAL, REQUEST, RELEASE
 
 # initializes the center of service
 model = Model(120, 5.0, 6.0, 1) # total_sim_time, inter_arrival_time, service_time, sequence
@@ -11,21 +11,34 @@ model.trace(True)
 # select the pseudo-random generator stream number
 model._rand.stream(1)
 
+# bind the attributes used by the loop to local names
+cause = model.cause
+schedule = model.schedule
+request = model.request
+release = model.release
+expntl = model._rand.expntl
+iat = model.inter_arrival_time
+st = model.service_time
+tmax = model.total_sim_time
+fel = model.fel
+count = model.count
+
 # execute the simulation
-while model.time() <= model.total_sim_time and model.fel._queue:
-    e = model.cause()
-    model.count += 1
-    match e.kind:
-        case '1': # arrival
-            model.schedule('2', 0.0, model.costumer)
-            model.schedule('1', model._rand.expntl(model.inter_arrival_time), model.costumer + 1)
-
-        case '2': # request
-            if model.request(model.costumer) is RESERVED:
-                model.schedule('3', model._rand.expntl(model.service_time), model.costumer)
-
-        case '3': # completion
-            model.release(model.costumer)
+now = model.now
+while now <= tmax and fel:
+    now, _, kind, customer = cause()
+    count += 1
+    if kind == ARRIVAL:
+        schedule(REQUEST, 0.0, customer)
+        schedule(ARRIVAL, expntl(iat), customer + 1)
+
+    elif kind == REQUEST:
+        if request(customer) == RESERVED:
+            schedule(RELEASE, expntl(st), customer)
+
+    elif kind == RELEASE:
+        release(customer)
+model.count = count
 
 # report of simulation
 model.report()
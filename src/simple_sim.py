@@ -22,101 +22,100 @@ A Python functional extension for discrete event simulation based in 'SMPL' (ori
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from __future__ import annotations
+
 import heapq
 import math
 import sys
 from collections import deque
+from typing import Final, TextIO
 
-RESERVED = 0
-QUEUED = 1
-
-class Event:
-    """
-    Information about the events of the simulation.
-    """
-    def __init__(self, kind, time, customer):
-        # kind of event - '1' = arrival, '2' = request, '3' = release
-        self.kind = kind
-
-        # time of occurrence
-        self.time = time
+RESERVED: Final = 0
+QUEUED: Final = 1
 
-        # client associated
-        self.customer = customer
+# kinds of events
+ARRIVAL: Final = 1
+REQUEST: Final = 2
+RELEASE: Final = 3
 
-    def __lt__(self, other):
-        """
-        Compare the time of occurrence of two events.
-        - Parameters:
-            - other (Event): event to be compared to.
-        - Returns:
-            - True, if self.time is lower than other.time
-            - False, if self.time is greater than other.time
-        """
-        return self.time < other.time
+# an event of the FEL: (time, seq, kind, customer)
+Event = tuple[float, int, int, int]
 
 class FEL:
     """
     Implementation of future events list as a queue (class heapq).
+    The events are tuples (time, seq, kind, customer), so the heap compares
+    them natively; seq keeps events with the same time in FIFO order.
     """
-    def __init__(self):
+    __slots__ = ('_queue', '_seq')
+
+    def __init__(self) -> None:
         # future events list
-        self._queue = []
+        self._queue: list[Event] = []
+
+        # sequence number of the next event
+        self._seq = 0
 
-    def append(self, e):
+    def append(self, time: float, kind: int, customer: int) -> None:
         """
         Add a new event to the queue.
         - Parameters:
-            - e (Event): new event to be added.
+            - time (float): time of occurrence of the event.
+            - kind (int): ARRIVAL, REQUEST or RELEASE.
+            - customer (int): customer associated to the event.
         """
-        heapq.heappush(self._queue, e)
+        heapq.heappush(self._queue, (time, self._seq, kind, customer))
+        self._seq += 1
 
-    def trigger(self):
+    def trigger(self) -> Event:
         """
         Trigger the head queue event.
         - Returns:
-            - The event to be executed.
+            - The event (time, seq, kind, customer) to be executed.
         """
-        e = heapq.heappop(self._queue)
-        return e
+        return heapq.heappop(self._queue)
+
+    def __len__(self) -> int:
+        return len(self._queue)
 
 class ResourceData:
     """
     Data of the resources.
+    The servers are identified by their index and their data is stored
+    in one list per attribute.
     """
-    def __init__(self, total_servers):
+    __slots__ = ('total_servers', 'busy_start', 'busy_time', 'free', 'by_customer')
+
+    def __init__(self, total_servers: int) -> None:
         """
         Object to store the resources data.
         - Parameters:
             - total_servers (int): Number of servers (resources).
         """
         self.total_servers = total_servers
-        self.busy_servers = 0
-        self.servers = [None] * total_servers
-        for i in range(0, total_servers):
-            self.servers[i] = Resource(i)
 
-class Resource:
-    """
-    An instance of a resource.
-    """
-    def __init__(self, index):
-        """
-        Create a resource.
-        - Parameters:
-            - index (int): Identifier of the resource
-        """
-        self.index = index
-        self.customer = 0
-        self.busy = False
-        self.busy_time = 0.0
-        self.total_busy_time = 0.0
+        # time at which each server was reserved
+        self.busy_start = [0.0] * total_servers
+
+        # total time each server was busy
+        self.busy_time = [0.0] * total_servers
+
+        # free servers, in the order they will be reserved
+        self.free = deque(range(total_servers))
+
+        # reserved servers, by the customer that holds them
+        self.by_customer: dict[int, int] = {}
 
 class Model:
     """
     A discrete event simulation model.
     """
-    def __init__(self, total_sim_time, inter_arrival_time, service_time, sequence):
+    __slots__ = ('now', 'total_sim_time', 'fel', 'req_queue', 'inter_arrival_time', 'service_time',
+                 '_resources', 'customer', 'count', '_rand', '_trace', '_trace_buf', '_model_name',
+                 '_prefix', '_output', '_queue_exit_counts', 'release_count', '_queue_length',
+                 'total_queueing_time', 'time_of_last_change')
+
+    def __init__(self, total_sim_time: float, inter_arrival_time: float, service_time: float, sequence: int) -> None:
         """
         Initialize the center of service (model).
         - Parameters:
@@ -135,7 +134,7 @@ class Model:
         self.fel = FEL()
 
         # request queue
-        self.req_queue = deque()
+        self.req_queue: deque[int] = deque()
 
         # mean inter arrival time of clients
         self.inter_arrival_time = inter_arrival_time
@@ -143,8 +142,8 @@ class Model:
         # mean service time
         self.service_time = service_time
 
-        # number of available resources
-        self._resources = {}
+        # number of available resources, set by resource()
+        self._resources: ResourceData
 
         # counter of customers
         self.customer = 1
@@ -154,7 +153,7 @@ class Model:
 
         # schedules the first event
         if sequence == 1:
-            self.schedule('1', 0.0, self.customer)
+            self.schedule(ARRIVAL, 0.0, self.customer)
 
         # pseudo-random number generator.
         self._rand = Rand()
@@ -162,7 +161,10 @@ class Model:
         # trace the events
         self._trace = False
 
-    def init(self, name):
+        # trace messages, written to the output by flush()
+        self._trace_buf: list[str] = []
+
+    def init(self, name: str) -> None:
         """
         Name the center of service (model).
         Initializes the metrics variables.
@@ -174,17 +176,20 @@ class Model:
 
         self._model_name = name
 
+        # prefix of the trace messages
+        self._prefix = f"({name}) \t"
+
         # output stream
-        self._output = sys.stdout
+        self._output: TextIO = sys.stdout
 
         # metrics variables
         self._queue_exit_counts = 0
         self.release_count = 0
         self._queue_length = 0
-        self.total_queueing_time = 0
-        self.time_of_last_change = 0
+        self.total_queueing_time = 0.0
+        self.time_of_last_change = 0.0
 
-    def time(self):
+    def time(self) -> float:
         """
         Gets the current time in the simulated environment.
         This value does not change until cause() is invoked.
@@ -193,15 +198,19 @@ class Model:
         """
         return self.now
 
-    def trace(self, trace_enable):
+    def trace(self, trace_enable: bool) -> None:
         """
         Turns trace on and off.
+        The trace messages are not written as the events occur: they are
+        buffered and written by flush(), which report() and run() call.
+        A loop written outside the model should call flush() itself if
+        it may stop before report().
         - Parameters:
             - trace_enable (bool): True to track the events.
         """
         self._trace = trace_enable
 
-    def resource(self, total_servers):
+    def resource(self, total_servers: int) -> None:
         """
         Abstraction of a resource.
         - Parameters:
@@ -212,19 +221,18 @@ class Model:
 
         self._resources = ResourceData(total_servers)
 
-    def schedule(self, kind, time_of_occur, customer):
+    def schedule(self, kind: int, time_of_occur: float, customer: int) -> None:
         """
         Schedules a event based on the time of occurrence.
         - Parameters:
-            - kind (char): '1' = arrival, '2' = request, '3' = release.
+            - kind (int): ARRIVAL, REQUEST or RELEASE.
             - time_of_occur (float): time of occurrence of the event.
             - customer (int): number of the customer associated to the event.
         """
-        # append a object Event to the fel
-        e = Event(kind, self.time() + time_of_occur, customer)
-        self.fel.append(e)
+        # append the event to the fel
+        self.fel.append(self.now + time_of_occur, kind, customer)
 
-    def request(self, customer):
+    def request(self, customer: int) -> int:
         """
         If a resource is free, request() reserves the resource,
         returning RESERVED. In case there is no resource(s), request() 
@@ -235,22 +243,13 @@ class Model:
             - RESERVED, if there is a free resource.
             - QUEUED, if there is no free resource(s).
         """
-        if self._resources.busy_servers < self._resources.total_servers:
-            chosen = None
-            for iterator in range (0, self._resources.total_servers):
-                server = self._resources.servers[iterator]
-                if server.busy is False:
-                    chosen = server
-                    break
-
-            chosen.busy = True
-            chosen.busy_time = self.now
-            chosen.customer = customer
-
-            self._resources.busy_servers += 1
+        if self._resources.free:
+            chosen = self._resources.free.popleft()
+            self._resources.busy_start[chosen] = self.now
+            self._resources.by_customer[customer] = chosen
 
             if self._trace:
-                print("({}) \tcustomer {} requested and accessed at {}.".format(self._model_name, customer, self.time()))
+                self._trace_buf.append(f"{self._prefix}customer {customer} requested and accessed at {self.now}.\n")
             return RESERVED
         else:
             # calculate the total queueing time
@@ -262,10 +261,10 @@ class Model:
             self.req_queue.append(customer)
             
             if self._trace:
-                print("({}) \tcustomer {} requested but queued at {}. (inq = {})".format(self._model_name, customer, self.time(), len(self.req_queue)))
+                self._trace_buf.append(f"{self._prefix}customer {customer} requested but queued at {self.now}. (inq = {len(self.req_queue)})\n")
             return QUEUED
 
-    def release(self, customer):
+    def release(self, customer: int) -> None:
         """
         If a request was enqueued, release() dequeue the request,
         putting it at the head of the FEL.
@@ -273,28 +272,19 @@ class Model:
         # release count
         self.release_count += 1
         
-        matching_server = None
-        for iterator in range(0, self._resources.total_servers):
-            server = self._resources.servers[iterator]
-            if server.customer == customer:
-                matching_server = server
-                break
-
+        matching_server = self._resources.by_customer.pop(customer, None)
         if matching_server is None:
             raise ValueError("There is no server reserved for the given customer.")
-            
-        matching_server.busy = False
-        matching_server.total_busy_time += self.now - matching_server.busy_time
 
-        self._resources.busy_servers -= 1
+        self._resources.busy_time[matching_server] += self.now - self._resources.busy_start[matching_server]
 
         if self._trace:
-            print("({}) \tcustomer {} leaving at {}.".format(self._model_name, self.customer, self.time()))
+            self._trace_buf.append(f"{self._prefix}customer {self.customer} leaving at {self.now}.\n")
 
         if len(self.req_queue) > 0:
             # dequeue an enqueued request
             customer = self.req_queue.popleft()
-            self.schedule('3', self._rand.expntl(self.service_time) , customer)
+            self.schedule(RELEASE, self._rand.expntl(self.service_time) , customer)
 
             # calculate the total queueing time
             self.total_queueing_time += self._queue_length * (self.now - self.time_of_last_change)
@@ -304,46 +294,185 @@ class Model:
             # increase queue exits
             self._queue_exit_counts += 1
 
-            matching_server.busy = True
-            matching_server.busy_time = self.now
-            matching_server.customer = customer
-
-            self._resources.busy_servers += 1
+            # the released server goes straight to the dequeued customer
+            self._resources.busy_start[matching_server] = self.now
+            self._resources.by_customer[customer] = matching_server
 
             if self._trace:
-                print("({}) \tcustomer {} dequeued and accessed at {}. (inq = {})".format(self._model_name, customer, self.time(), len(self.req_queue)))
+                self._trace_buf.append(f"{self._prefix}customer {customer} dequeued and accessed at {self.now}. (inq = {len(self.req_queue)})\n")
+        else:
+            self._resources.free.append(matching_server)
 
-    def cause(self):
+    def cause(self) -> Event:
         """
         Dequeue the head of FEL, increase the time of simulation
         to the time of occurrence of the dequeued event.
         - Returns:
-            - Head event of FEL.
+            - Head event of FEL, as a tuple (time, seq, kind, customer).
         """
         # trigger a event, set the time of simulation and current customer
         e = self.fel.trigger()
-        self.now = e.time
-        self.customer = e.customer
+        self.now, _, kind, self.customer = e
 
-        if e.kind == '1' and self._trace:
-            print("({}) \tcustomer {} arrived at {}.".format(self._model_name, self.customer, self.time()))
+        if kind == ARRIVAL and self._trace:
+            self._trace_buf.append(f"{self._prefix}customer {self.customer} arrived at {self.now}.\n")
         return e
 
-    def U(self):
+    def run(self) -> None:
+        """
+        Executes the simulation of the center of service until the total
+        simulation time: each arrival requests a server and schedules the
+        next arrival, and each reserved request schedules its release.
+        With trace enabled the events go through cause(), schedule(),
+        request() and release(); otherwise the same steps are executed
+        inline, on local variables, which is much faster.
+        """
+        fel = self.fel
+        if self._trace:
+            try:
+                while self.now <= self.total_sim_time and self.fel:
+                    _, _, kind, customer = self.cause()
+                    self.count += 1
+                    if kind == ARRIVAL:
+                        self.schedule(REQUEST, 0.0, customer)
+                        self.schedule(ARRIVAL, self._rand.expntl(self.inter_arrival_time), customer + 1)
+                    elif kind == REQUEST:
+                        if self.request(customer) == RESERVED:
+                            self.schedule(RELEASE, self._rand.expntl(self.service_time), customer)
+                    elif kind == RELEASE:
+                        self.release(customer)
+            finally:
+                # the trace is written even if an event handler raised
+                self.flush()
+            return
+
+        # the head event stays in the heap while it is handled, so that the
+        # first event it schedules replaces it in a single sift (heapreplace)
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        heapreplace = heapq.heapreplace
+        queue = fel._queue
+        seq = fel._seq
+
+        # exponential variates are read straight from the Rand buffer, which
+        # is refilled in place
+        rand = self._rand
+        logbuf = rand._logbuf
+        idx = rand._idx
+        batch = Rand.BATCH
+
+        free = self._resources.free
+        by_customer = self._resources.by_customer
+        busy_start = self._resources.busy_start
+        busy_time = self._resources.busy_time
+        req_queue = self.req_queue
+
+        tmax = self.total_sim_time
+        iat = self.inter_arrival_time
+        st = self.service_time
+
+        now = self.now
+        customer = self.customer
+        count = self.count
+        release_count = self.release_count
+        queue_exit_counts = self._queue_exit_counts
+        queue_length = self._queue_length
+        total_queueing_time = self.total_queueing_time
+        time_of_last_change = self.time_of_last_change
+
+        try:
+            while now <= tmax and queue:
+                now, _, kind, customer = queue[0]
+                count += 1
+                if kind == ARRIVAL:
+                    # arrival: immediate request and next arrival
+                    heapreplace(queue, (now, seq, REQUEST, customer))
+                    seq += 1
+                    if idx == batch:
+                        rand._refill()
+                        idx = 0
+                    heappush(queue, (now + iat * logbuf[idx], seq, ARRIVAL, customer + 1))
+                    idx += 1
+                    seq += 1
+                elif kind == REQUEST:
+                    # request
+                    if free:
+                        server = free.popleft()
+                        busy_start[server] = now
+                        by_customer[customer] = server
+                        if idx == batch:
+                            try:
+                                rand._refill()
+                            except ValueError:
+                                # consumed, as cause() does before expntl() raises
+                                heappop(queue)
+                                raise
+                            idx = 0
+                        heapreplace(queue, (now + st * logbuf[idx], seq, RELEASE, customer))
+                        idx += 1
+                        seq += 1
+                    else:
+                        heappop(queue)
+                        total_queueing_time += queue_length * (now - time_of_last_change)
+                        queue_length += 1
+                        time_of_last_change = now
+                        req_queue.append(customer)
+                elif kind == RELEASE:
+                    # release
+                    release_count += 1
+                    released = by_customer.pop(customer, None)
+                    if released is None:
+                        # consumed, as cause() does before release() raises
+                        heappop(queue)
+                        raise ValueError("There is no server reserved for the given customer.")
+                    busy_time[released] += now - busy_start[released]
+                    if req_queue:
+                        waiting = req_queue.popleft()
+                        if idx == batch:
+                            try:
+                                rand._refill()
+                            except ValueError:
+                                # consumed, as cause() does before expntl() raises
+                                heappop(queue)
+                                raise
+                            idx = 0
+                        heapreplace(queue, (now + st * logbuf[idx], seq, RELEASE, waiting))
+                        idx += 1
+                        seq += 1
+                        total_queueing_time += queue_length * (now - time_of_last_change)
+                        queue_length -= 1
+                        time_of_last_change = now
+                        queue_exit_counts += 1
+                        busy_start[released] = now
+                        by_customer[waiting] = released
+                    else:
+                        heappop(queue)
+                        free.append(released)
+                else:
+                    heappop(queue)
+        finally:
+            # write the state back even if an event handler raised
+            fel._seq = seq
+            rand._idx = idx
+            self.now = now
+            self.customer = customer
+            self.count = count
+            self.release_count = release_count
+            self._queue_exit_counts = queue_exit_counts
+            self._queue_length = queue_length
+            self.total_queueing_time = total_queueing_time
+            self.time_of_last_change = time_of_last_change
+
+    def U(self) -> float:
         """
         Calculate the utilization of the resource.
         Sum the percentage use of each server when it was busy.
         - Returns:
             - The utilization of the servers
         """
-        utilization = 0.0
-        for iterator in range(0, self._resources.total_servers):
-            server = self._resources.servers[iterator]
-            utilization += server.total_busy_time
-        utilization /= self.total_sim_time
-        return utilization
+        return sum(self._resources.busy_time) / self.total_sim_time
 
-    def B(self):
+    def B(self) -> float:
         """
         Calculate the mean busy time of a resource.
         The busy time of a server is the time spent to a completion
@@ -351,26 +480,43 @@ class Model:
         - Returns:
             - The mean busy time of a resource.
         """
-        total_busy_time = 0.0
-        for iterator in range(0, self._resources.total_servers):
-            server = self._resources.servers[iterator]
-            total_busy_time += server.total_busy_time
+        total_busy_time = sum(self._resources.busy_time)
         return (total_busy_time / self.release_count) if self.release_count > 0 else total_busy_time
 
-    def report(self):
+    def Lq(self) -> float:
+        """
+        Calculate the average queue length.
+        The queue length is integrated by request() and release()
+        up to the last change of the queue.
+        - Returns:
+            - The average queue length.
+        """
+        return self.total_queueing_time / self.total_sim_time
+
+    def flush(self) -> None:
+        """
+        Writes the buffered trace messages to the output.
+        """
+        self._output.writelines(self._trace_buf)
+        self._trace_buf.clear()
+
+    def report(self) -> None:
         """
         Generates a report message with utilization, mean
         busy time, average queue length, total releases 
         and queue exits count.
+        Writes the buffered trace messages before the report.
         """
+        self.flush()
+
         self._output.write("\n")
         self._output.write("\t-----------SIMULATION REPORT-----------\t\n")
         self._output.write("Model name: %-17s\n" % self._model_name)
-        self._output.write("Time: %.2f\n" % self.time())
+        self._output.write("Time: %.2f\n" % self.now)
         self._output.write("Resource (servers): %d\n" % self._resources.total_servers)
         self._output.write("Utilization: %.2f\n" % self.U())
         self._output.write("Mean busy time: %.2f\n" % self.B())
-        self._output.write("Average queue length: %.2f\n" % (self.total_queueing_time / self.total_sim_time))
+        self._output.write("Average queue length: %.2f\n" % self.Lq())
         self._output.write("Total releases: %d\n" % self.release_count)
         self._output.write("Queue exits: %d\n" % self._queue_exit_counts)
 
@@ -378,27 +524,40 @@ class Rand:
     """
     A Python implementation of the pseudo-random number generator of 'smpl'.
     """
+    __slots__ = ('_seed', '_buf', '_logbuf', '_idx')
 
-    DEFAULT_STREAMS = [ 1973272912, 747177549, 20464843, 640830765, 1098742207, 78126602, 84743774, 831312807, 124667236, 1172177002, 1124933064, 1223960546, 1878892440, 1449793615, 553303732 ]
+    DEFAULT_STREAMS: Final = [ 1973272912, 747177549, 20464843, 640830765, 1098742207, 78126602, 84743774, 831312807, 124667236, 1172177002, 1124933064, 1223960546, 1878892440, 1449793615, 553303732 ]
     """
     Default seeds for streams 1-15.
     """
 
-    A = 16807
+    A: Final = 16807
     """
     Multiplier (7**5) for 'ranf'.
     """
 
-    M = 2147483647
+    M: Final = 2147483647
     """
     Modulus (2**31-1) for 'ranf'.
     """
 
-    def __init__(self):
+    BATCH: Final = 1024
+    """
+    Number of values generated at each refill of the buffer.
+    """
+
+    def __init__(self) -> None:
         # Seed for current stream.
         self._seed = 0
 
-    def stream(self, stream_number):
+        # pre-generated values, their negated logarithms (for 'expntl')
+        # and index of the next one to be returned; the buffers are
+        # allocated once and overwritten at each refill
+        self._buf = [0.0] * Rand.BATCH
+        self._logbuf = [0.0] * Rand.BATCH
+        self._idx = Rand.BATCH
+
+    def stream(self, stream_number: int) -> None:
         """
         Change the current generator stream.
         Valid stream numbers range from 1 to 15.
@@ -411,66 +570,49 @@ class Rand:
 
         self._seed = Rand.DEFAULT_STREAMS[stream_number - 1]
 
-    def ranf(self):
+        # discard the values generated from the previous stream
+        self._idx = Rand.BATCH
+
+    def _refill(self) -> None:
+        """
+        Generates the next BATCH values of the current stream.
+        The sequence is the same of 'smpl' (I = 16807 * I mod (2**31-1)),
+        the batch only removes the per call overhead of 'ranf' and 'expntl'.
+        """
+        if self._seed == 0:
+            raise ValueError("No random number generator stream selected!")
+
+        # the seed is kept in a local and stored back once per batch
+        a = Rand.A
+        m = Rand.M
+        seed = self._seed
+        buf = self._buf
+        logbuf = self._logbuf
+        log = math.log
+        # Python integers do not overflow, so the product is reduced directly,
+        # without the 32-bit tricks of the C version (or Schrage's method)
+        for i in range(Rand.BATCH):
+            seed = seed * a % m
+            u = seed * 4.656612875E-10
+            buf[i] = u
+            logbuf[i] = -log(u)
+        self._seed = seed
+        self._idx = 0
+
+    def ranf(self) -> float:
         """
         Generates a pseudo-random value from an uniform distribution ranging
         from 0 to 1.
         - Returns:
             - The generated pseudo-random number.
         """
+        if self._idx == Rand.BATCH:
+            self._refill()
+        u = self._buf[self._idx]
+        self._idx += 1
+        return u
 
-        # The comments below are based on the original comments of 'smpl'.
-        # In the comments, The lower short of I is called 'L', and the higher short of I is called 'H'.
-
-        # 16807*H->Hi
-        # [C] p=(short *)&I
-        # [C] Hi=*(p+1)*A
-        # (p is a pointer to I)
-        hi = get_short1(self._seed) * Rand.A
-
-        # 16807*L->Lo
-        # [C] *(p+1)=0
-        # (p is a pointer to I)
-        self._seed = set_short1(self._seed, 0)
-
-        # [C] Lo=I*A
-        # (p is a pointer to I)
-        lo = self._seed * Rand.A
-
-        # add high-order bits of Lo to Hi
-        # [C] p=(short *)&Lo
-        # [C] Hi+=*(p+1)
-        # (p is a pointer to Lo)
-        hi += get_short1(lo)
-
-        # low-order bits of Hi->LO
-        # [C] q=(short *)&Hi
-        # (q is a pointer to Hi)
-
-        # clear sign bit
-        # [C] *(p+1)=*q&0X7FFF
-        # (p is a pointer to Lo, q is a pointer to Hi)
-        lo = set_short1(lo, get_short0(hi) & 0x7FFF)
-
-        # Hi bits 31-45->K
-        # [C] k=*(q+1)<<1
-        # [C] if (*q&0x8000) { k++ }
-        # (q is a pointer to Hi)
-        k = get_short1(hi) << 1
-        if (get_short0(hi) & 0x8000) != 0:
-            k += 1
-
-        # form Z + K [- M] (where Z=Lo): presubtract M to avoid overflow
-        lo -= Rand.M
-        lo += k
-        if lo < 0:
-            lo += Rand.M
-        self._seed = lo
-
-        # Lo x 1/(2**31-1)
-        return (lo * 4.656612875E-10)
-
-    def expntl(self, mean):
+    def expntl(self, mean: float) -> float:
         """
         Generates a pseudo-random value from an exponential distribution.
         - Parameters:
@@ -478,46 +620,10 @@ class Rand:
         - Returns:
             - The generated pseudo-random number.
         """
-        return -mean * math.log(self.ranf())
-
-def set_short0(int_value, short_value):
-    """
-    Sets the least significant short of an integer.
-    - Parameters:
-        - int_value (int): The integer.
-        - short_value (int): The short.
-    - Returns:
-        - The integer with the least significant short replaced.
-    """
-    return (int_value & 0xFFFF0000) | (short_value & 0x0000FFFF)
-
-def set_short1(int_value, short_value):
-    """
-    Sets the most significant short of an integer.
-    - Parameters:
-        - int_value (int): The integer.
-        - short_value (int): The short.
-    - Returns:
-        - The integer with the most significant short replaced.
-    """
-    return (int_value & 0x0000FFFF) | ((short_value << 16) & 0xFFFF0000)
-
-def get_short0(int_value):
-    """
-    Gets the least significant short of an integer.
-    - Parameters:
-        - int_value (int): The integer.
-    - Returns:
-        - The least significant short of the integer.
-    """
-    return int_value & 0x0000FFFF
-
-def get_short1(int_value):
-    """
-    Gets the most significant short of an integer.
-    - Parameters:
-        - int_value (int): The integer.
-    - Returns:
-        - The most significant short of the integer.
-    """
-    return (int_value >> 16) & 0x0000FFFF
+        # ranf and expntl share the index, so each call consumes one value
+        # of the stream, as -mean * log(ranf()) did
+        if self._idx == Rand.BATCH:
+            self._refill()
+        x = mean * self._logbuf[self._idx]
+        self._idx += 1
+        return x